@@ -0,0 +1,32 @@
+"""
+Ahead-of-time compile the resource feeding kernel with numba.pycc.
+
+Produces a ``manifold_kernel`` extension module next to this file;
+manifold_fast.py imports it when present and otherwise falls back to the
+JIT-compiled kernel.
+
+Usage: python build_kernels.py
+"""
+
+import os
+
+from numba.pycc import CC
+
+from manifold_fast import _feed_candidates
+
+# candidates, energy, collected, pos, resource_grid
+FEED_CANDIDATES_SIGNATURE = (
+    "void(int64[:], int16[:], int32[:], int32[:, :], int16[:, :])"
+)
+
+
+def build():
+    cc = CC("manifold_kernel")
+    cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+    kernel = _feed_candidates.py_func
+    cc.export("feed_candidates", FEED_CANDIDATES_SIGNATURE)(kernel)
+    cc.compile()
+
+
+if __name__ == "__main__":
+    build()
@@ -3,153 +3,52 @@ Mesa-based Agent Simulation for The Manifold Web
 
 Demonstrates basic agent behavior: movement, energy consumption, and resource
 gathering in a grid environment.
+
+The model comes from manifold_fast (NumPy/Numba) on CPython and from the
+pure-Python manifold_core under PyPy; both expose the same API.
 """
 
-import random
-from mesa import Agent, Model
-from mesa.time import RandomActivation
-from mesa.space import MultiGrid
-from mesa.datacollection import DataCollector
-
-
-class Resource:
-    """A resource in the environment that agents can consume."""
-
-    def __init__(self, energy_value):
-        self.energy_value = energy_value
-        self.consumed = False
-
-
-class ManifoldAgent(Agent):
-    """An autonomous agent in the Manifold simulation."""
-
-    def __init__(self, unique_id, model, initial_energy=100):
-        super().__init__(unique_id, model)
-        self.energy = initial_energy
-        self.alive = True
-        self.resources_collected = 0
-
-    def move(self):
-        """Move to a random neighboring cell."""
-        possible_steps = self.model.grid.get_neighborhood(
-            self.pos, moore=True, include_center=False
-        )
-        new_position = self.random.choice(possible_steps)
-        self.model.grid.move_agent(self, new_position)
-
-    def consume_resource(self):
-        """Check for and consume resources at current position."""
-        cellmates = self.model.grid.get_cell_list_contents([self.pos])
-        resources = [obj for obj in cellmates if isinstance(obj, Resource)]
-
-        for resource in resources:
-            if not resource.consumed:
-                self.energy += resource.energy_value
-                resource.consumed = True
-                self.resources_collected += 1
-                print(
-                    f"Agent {self.unique_id} consumed resource worth "
-                    f"{resource.energy_value} energy (total: {self.energy})"
-                )
-                break
-
-    def step(self):
-        """Execute one time step of agent behavior."""
-        if not self.alive:
-            return
-
-        # Move to new position
-        self.move()
-
-        # Lose energy from movement
-        self.energy -= 1
-
-        # Try to consume resource at new position
-        self.consume_resource()
-
-        # Check if agent dies from lack of energy
-        if self.energy <= 0:
-            self.alive = False
-            print(f"Agent {self.unique_id} died from lack of energy")
-
-
-class ManifoldModel(Model):
-    """The main simulation model."""
-
-    def __init__(
-        self, n_agents=10, width=20, height=20, n_resources=15, seed=None
-    ):
-        super().__init__()
-        self.num_agents = n_agents
-        self.grid = MultiGrid(width, height, torus=True)
-        self.schedule = RandomActivation(self)
-
-        if seed is not None:
-            random.seed(seed)
-
-        # Create agents
-        for i in range(self.num_agents):
-            agent = ManifoldAgent(i, self, initial_energy=100)
-            self.schedule.add(agent)
-
-            # Place agent at random position
-            x = self.random.randrange(self.grid.width)
-            y = self.random.randrange(self.grid.height)
-            self.grid.place_agent(agent, (x, y))
-
-        # Create resources
-        for _ in range(n_resources):
-            resource = Resource(energy_value=10)
-            x = self.random.randrange(self.grid.width)
-            y = self.random.randrange(self.grid.height)
-            self.grid.place_agent(resource, (x, y))
-
-        # Data collection
-        self.datacollector = DataCollector(
-            model_reporters={
-                "Alive Agents": lambda m: sum(
-                    1 for a in m.schedule.agents if a.alive
-                )
-            },
-            agent_reporters={"Energy": "energy", "Alive": "alive"},
-        )
-
-    def step(self):
-        """Advance the model by one step."""
-        self.datacollector.collect(self)
-        self.schedule.step()
-
-
-def run_simulation(steps=50, n_agents=10, seed=42):
+import sys
+from functools import partial
+from multiprocessing import Pool, cpu_count
+
+if sys.implementation.name == "pypy":
+    # PyPy's tracing JIT runs the plain Mesa objects fastest
+    from manifold_core import ManifoldAgent, ManifoldModel
+else:
+    from manifold_fast import ManifoldAgent, ManifoldModel
+
+
+def run_simulation(steps=50, n_agents=10, seed=42, verbose=False):
     """Run the simulation and display results."""
     print("=" * 60)
     print("🌐 The Manifold Web - Agent Simulation")
     print("=" * 60)
     print(f"Initializing with {n_agents} agents...\n")
 
-    model = ManifoldModel(n_agents=n_agents, seed=seed)
+    model = ManifoldModel(n_agents=n_agents, seed=seed, verbose=verbose)
 
     print(f"Running simulation for {steps} steps...\n")
 
     for i in range(steps):
         model.step()
         if (i + 1) % 10 == 0:
-            alive = sum(1 for a in model.schedule.agents if a.alive)
-            print(f"Step {i + 1}: {alive} agents alive")
+            print(f"Step {i + 1}: {model.n_alive} agents alive")
 
     print("\n" + "=" * 60)
     print("Simulation Complete")
     print("=" * 60)
 
     # Summary statistics
-    alive_agents = [a for a in model.schedule.agents if a.alive]
+    summary = model.summary()
+    n_alive = summary["alive"]
     print(f"\nFinal Status:")
-    print(f"  Alive agents: {len(alive_agents)}")
-    print(f"  Dead agents: {model.num_agents - len(alive_agents)}")
+    print(f"  Alive agents: {n_alive}")
+    print(f"  Dead agents: {model.num_agents - n_alive}")
 
-    if alive_agents:
-        avg_energy = sum(a.energy for a in alive_agents) / len(alive_agents)
-        total_resources = sum(a.resources_collected for a in model.schedule.agents)
+    if n_alive:
+        avg_energy = summary["mean_energy"]
+        total_resources = sum(summary["resources_collected"])
         print(f"  Average energy (alive): {avg_energy:.2f}")
         print(f"  Total resources collected: {total_resources}")
 
@@ -158,5 +57,44 @@ def run_simulation(steps=50, n_agents=10, seed=42):
     return model
 
 
+# Below this many replicas the pool start-up costs more than it saves
+MIN_PARALLEL_REPLICAS = 4
+
+
+def _run_replica(seed, steps, n_agents):
+    """Run one independent replica and return its final state."""
+    model = ManifoldModel(n_agents=n_agents, seed=seed)
+    for _ in range(steps):
+        model.step()
+
+    return {
+        "seed": seed,
+        **model.summary(),
+        "alive_count_history": list(model.alive_count_history),
+    }
+
+
+def run_batch(n_replicas, steps=50, n_agents=10, seeds=None, processes=None):
+    """
+    Run independent simulation replicas across CPU cores.
+
+    Each replica gets its own seed (``range(n_replicas)`` by default) and a
+    result dict is returned per seed, in seed order; explicit ``seeds`` must
+    supply exactly ``n_replicas`` of them. Small batches run sequentially
+    in-process.
+    """
+    if seeds is None:
+        seeds = list(range(n_replicas))
+    elif len(seeds) != n_replicas:
+        raise ValueError(f"got {len(seeds)} seeds for {n_replicas} replicas")
+    run_one = partial(_run_replica, steps=steps, n_agents=n_agents)
+
+    if len(seeds) < MIN_PARALLEL_REPLICAS or processes == 1:
+        return [run_one(seed) for seed in seeds]
+
+    with Pool(processes or cpu_count()) as pool:
+        return pool.map(run_one, seeds)
+
+
 if __name__ == "__main__":
     model = run_simulation(steps=50, n_agents=10, seed=42)
@@ -5,38 +5,94 @@ Demonstrates evolutionary computation with byte-array genomes similar to the
 Rust implementation in manifold-node.
 """
 
-import random
-from deap import base, creator, tools, algorithms
+from concurrent.futures import ThreadPoolExecutor
+from deap import base, creator, tools
 import numpy as np
 
+try:
+    # Optional Cython operators, built with: python setup.py build_ext --inplace
+    import ga_ops
+except ImportError:
+    ga_ops = None
 
-def evaluate_genome(individual):
+try:
+    # Optional GPU backend for evolve_device
+    import cupy
+except ImportError:
+    cupy = None
+
+# Default generator for operators called outside a seeded toolbox
+_rng = np.random.default_rng()
+
+# Rows handed to each thread by the GIL-free Cython evaluator
+EVAL_CHUNK_ROWS = 4096
+
+
+def evaluate_genome(genomes):
     """
     Fitness function: sum of byte values (simple example).
 
+    Accepts a 2-D array of shape (pop_size, genome_length) and returns one
+    fitness per row, so a whole population is scored in a single NumPy call.
+    A single 1-D genome gets the usual DEAP ``(fitness,)`` tuple instead.
+
     In a real scenario, this would execute the genome's behavior and measure
     performance metrics like energy collected, survival time, or reproductive
     success.
     """
-    return (sum(individual),)
+    genomes = np.asarray(genomes, dtype=np.uint8)
+    if genomes.ndim == 1:
+        return (int(genomes.sum(dtype=np.int32)),)
+    return genomes.sum(axis=-1, dtype=np.int32)
+
+
+def batch_map(evaluate, individuals):
+    """
+    Drop-in replacement for ``toolbox.map`` that evaluates in one batch.
+
+    DEAP calls ``toolbox.map(toolbox.evaluate, invalid_ind)``; instead of
+    dispatching once per individual, stack them into a matrix and hand the
+    whole batch to ``evaluate``.
+    """
+    individuals = list(individuals)
+    if not individuals:
+        return []
+    fitnesses = evaluate(np.asarray(individuals, dtype=np.uint8))
+    return [(int(f),) for f in fitnesses]
 
 
-def mutate_byte_flip(individual, mutation_rate):
+def mutate_byte_flip(individual, mutation_rate, rng=_rng):
     """
     Bit-flip mutation matching the Rust implementation.
 
     For each byte in the genome, flip random bits with probability
-    mutation_rate.
+    mutation_rate. The per-byte flips are assembled into one XOR mask which,
+    for genomes that are a multiple of 8 bytes, is applied eight bytes at a
+    time through a uint64 view of the genome. Also accepts a whole
+    (pop_size, genome_length) matrix, mutating every byte independently.
     """
-    for i in range(len(individual)):
-        if random.random() < mutation_rate:
-            # Flip a random bit in this byte
-            bit_position = random.randint(0, 7)
-            individual[i] ^= 1 << bit_position
+    n = individual.size
+
+    # Drawing the hit count from Binomial(n, p) and then that many distinct
+    # positions is equivalent to an independent draw per byte, but only
+    # touches the RNG for the bytes that actually mutate.
+    k = rng.binomial(n, mutation_rate)
+    if k == 0:
+        return (individual,)
+
+    mask = np.zeros(n, dtype=np.uint8)
+    hits = rng.choice(n, size=k, replace=False)
+    mask[hits] = 1 << rng.integers(0, 8, size=k, dtype=np.uint8)
+
+    if n % 8 == 0 and individual.flags.c_contiguous:
+        lanes = individual.reshape(-1).view(np.uint64)
+        lanes ^= mask.view(np.uint64)
+    else:
+        individual ^= mask.reshape(individual.shape)
     return (individual,)
 
 
-def crossover_single_point(ind1, ind2):
+def crossover_single_point(ind1, ind2, rng=_rng):
     """
     Single-point crossover matching the Rust implementation.
 
@@ -44,7 +100,7 @@ def crossover_single_point(ind1, ind2):
     """
     size = min(len(ind1), len(ind2))
     if size > 1:
-        crossover_point = random.randint(1, size - 1)
+        crossover_point = int(rng.integers(1, size))
         ind1[crossover_point:], ind2[crossover_point:] = (
             ind2[crossover_point:].copy(),
             ind1[crossover_point:].copy(),
@@ -52,43 +108,351 @@ def crossover_single_point(ind1, ind2):
     return ind1, ind2
 
 
-def create_toolbox(genome_length=32, mutation_rate=0.01):
-    """Set up DEAP toolbox with genetic operators."""
+def crossover_batch(parents1, parents2, rng=_rng, xp=np):
+    """
+    Single-point crossover for a whole batch of pairs at once.
+
+    Takes two (n_pairs, genome_length) parent matrices, draws one crossover
+    point per pair and returns both child matrices, built with a column mask
+    instead of per-pair slicing. ``xp`` is the array module the parents live
+    in, so evolve_device can run the same code on the GPU.
+    """
+    n_pairs, length = parents1.shape
+    if length < 2:
+        return parents1.copy(), parents2.copy()
+
+    points = rng.integers(1, length, size=n_pairs)
+    tail = xp.arange(length)[None, :] >= points[:, None]
+    return xp.where(tail, parents2, parents1), xp.where(tail, parents1, parents2)
+
+
+def tournament_indices(fitnesses, k, tournsize, rng=_rng, xp=np):
+    """
+    Tournament selection with all k tournaments drawn at once.
+
+    Samples a (k, tournsize) matrix of contestant indices into the fitness
+    vector and returns each row's winner, found with a single argmax.
+    ``xp`` is the array module holding ``fitnesses``.
+    """
+    contestants = rng.integers(0, len(fitnesses), size=(k, tournsize))
+    return contestants[xp.arange(k), fitnesses[contestants].argmax(axis=1)]
+
+
+def select_tournament(individuals, k, tournsize, rng=_rng):
+    """DEAP-style wrapper around tournament_indices for Individual lists."""
+    fitnesses = np.fromiter(
+        (ind.fitness.values[0] for ind in individuals),
+        dtype=np.float64,
+        count=len(individuals),
+    )
+    winners = tournament_indices(fitnesses, k, tournsize, rng)
+    return [individuals[i] for i in winners]
+
+
+def _native_seed(rng):
+    """Fresh nonzero seed for one call into the Cython kernels."""
+    return int(rng.integers(1, 2**63))
+
+
+def evaluate_genome_native(genomes):
+    """
+    Cython version of evaluate_genome for (pop_size, genome_length) batches.
+
+    Large batches are split into row chunks that are summed concurrently,
+    since the kernel runs without the GIL.
+    """
+    genomes = np.ascontiguousarray(genomes, dtype=np.uint8)
+    if genomes.ndim == 1:
+        return evaluate_genome(genomes)
+    fitnesses = np.empty(len(genomes), dtype=np.int32)
+    starts = range(0, len(genomes), EVAL_CHUNK_ROWS)
+    if len(starts) <= 1:
+        ga_ops.evaluate_batch(genomes, fitnesses)
+        return fitnesses
+
+    def evaluate_chunk(start):
+        stop = start + EVAL_CHUNK_ROWS
+        ga_ops.evaluate_batch(genomes[start:stop], fitnesses[start:stop])
+
+    with ThreadPoolExecutor() as pool:
+        list(pool.map(evaluate_chunk, starts))
+    return fitnesses
+
+
+def mutate_byte_flip_native(individual, mutation_rate, rng=_rng):
+    """Cython version of mutate_byte_flip, in place."""
+    if individual.ndim == 2:
+        ga_ops.mutate_batch(individual, mutation_rate, _native_seed(rng))
+    else:
+        ga_ops.mutate_row(individual, mutation_rate, _native_seed(rng))
+    return (individual,)
+
+
+def crossover_batch_native(parents1, parents2, rng=_rng):
+    """Cython version of crossover_batch."""
+    child1 = np.array(parents1, dtype=np.uint8, order="C")
+    child2 = np.array(parents2, dtype=np.uint8, order="C")
+    n_pairs, length = child1.shape
+    if length >= 2:
+        points = rng.integers(1, length, size=n_pairs, dtype=np.int64)
+        ga_ops.crossover_batch(child1, child2, points)
+    return child1, child2
+
+
+class Population(list):
+    """
+    List of Individuals backed by one contiguous genome matrix.
+
+    Each Individual is a row view of ``genomes`` and ``fitnesses`` holds
+    the matching fitness values, so evolve() can work on the matrix directly
+    while DEAP tools keep seeing a plain list of individuals.
+    """
 
-    # Create fitness and individual types
-    creator.create("FitnessMax", base.Fitness, weights=(1.0,))
-    creator.create("Individual", list, fitness=creator.FitnessMax)
+    def __init__(self, genomes):
+        self.genomes = genomes
+        self.fitnesses = np.zeros(len(genomes))
+        super().__init__(self._row_view(row) for row in genomes)
+
+    @staticmethod
+    def _row_view(row):
+        individual = row.view(creator.Individual)
+        individual.fitness = creator.FitnessMax()
+        return individual
+
+    def sync_fitness(self):
+        """Copy the fitness vector into each Individual's fitness."""
+        for individual, fitness in zip(self, self.fitnesses):
+            individual.fitness.values = (fitness,)
+
+
+def init_population(n, genome_length, rng=_rng):
+    """Create a Population of n random byte genomes."""
+    genomes = rng.integers(0, 256, size=(n, genome_length), dtype=np.uint8)
+    return Population(genomes)
+
+
+def create_toolbox(genome_length=32, mutation_rate=0.01, seed=None):
+    """
+    Set up DEAP toolbox with genetic operators.
+
+    Every random operator draws from one Generator seeded with ``seed``,
+    kept as ``toolbox.rng``, so a run is reproducible from its seed.
+    """
+
+    # Create fitness and individual types, once per process
+    if not hasattr(creator, "Individual"):
+        creator.create("FitnessMax", base.Fitness, weights=(1.0,))
+        creator.create("Individual", np.ndarray, fitness=creator.FitnessMax)
 
     toolbox = base.Toolbox()
+    toolbox.rng = rng = np.random.default_rng(seed)
 
-    # Genome initialization: random bytes (0-255)
-    toolbox.register("byte", random.randint, 0, 255)
+    # Genome initialization: random bytes (0-255) as a packed uint8 array
+    toolbox.register(
+        "genome",
+        rng.integers,
+        0,
+        256,
+        size=genome_length,
+        dtype=np.uint8,
+    )
     toolbox.register(
         "individual",
-        tools.initRepeat,
+        tools.initIterate,
         creator.Individual,
-        toolbox.byte,
-        genome_length,
+        toolbox.genome,
+    )
+    toolbox.register(
+        "population", init_population, genome_length=genome_length, rng=rng
     )
-    toolbox.register("population", tools.initRepeat, list, toolbox.individual)
 
     # Genetic operators
     toolbox.register("evaluate", evaluate_genome)
-    toolbox.register("mate", crossover_single_point)
-    toolbox.register("mutate", mutate_byte_flip, mutation_rate=mutation_rate)
-    toolbox.register("select", tools.selTournament, tournsize=3)
+    toolbox.register("map", batch_map)
+    toolbox.register("mate", crossover_single_point, rng=rng)
+    toolbox.register("mate_batch", crossover_batch, rng=rng)
+    toolbox.register(
+        "mutate", mutate_byte_flip, mutation_rate=mutation_rate, rng=rng
+    )
+    toolbox.register("select", select_tournament, tournsize=3, rng=rng)
+    toolbox.register("select_indices", tournament_indices, tournsize=3, rng=rng)
+
+    if ga_ops is not None:
+        toolbox.register("evaluate", evaluate_genome_native)
+        toolbox.register("mate_batch", crossover_batch_native, rng=rng)
+        toolbox.register(
+            "mutate", mutate_byte_flip_native, mutation_rate=mutation_rate, rng=rng
+        )
 
     return toolbox
 
 
+def var_and(genomes, toolbox, cxpb, mutpb):
+    """
+    Batched equivalent of ``algorithms.varAnd`` on a genome matrix.
+
+    Rows (0, 1), (2, 3), ... are mated with probability cxpb through
+    ``toolbox.mate_batch`` in one call, then each row is mutated with
+    probability mutpb through one ``toolbox.mutate`` call on the selected
+    rows. The probability draws come from ``toolbox.rng``. Works in place
+    and returns a mask of the rows that changed.
+    """
+    rng = toolbox.rng
+    changed = np.zeros(len(genomes), dtype=np.bool_)
+
+    pairs = np.flatnonzero(rng.random(len(genomes) // 2) < cxpb)
+    if pairs.size:
+        first, second = 2 * pairs, 2 * pairs + 1
+        genomes[first], genomes[second] = toolbox.mate_batch(
+            genomes[first], genomes[second]
+        )
+        changed[first] = changed[second] = True
+
+    rows = np.flatnonzero(rng.random(len(genomes)) < mutpb)
+    if rows.size:
+        (block,) = toolbox.mutate(genomes[rows])
+        genomes[rows] = block
+        changed[rows] = True
+
+    return changed
+
+
+def evolve(population, toolbox, cxpb, mutpb, ngen, stats=None, verbose=False):
+    """
+    Generational loop of ``algorithms.eaSimple`` on a population matrix.
+
+    Works on a persistent (pop_size, L) uint8 matrix with a parallel
+    fitness vector: a Population's own matrix, or the individuals stacked
+    once for a plain list. Selection gathers rows into a second buffer,
+    variation works on the matrix in place and every generation is scored
+    with a single ``toolbox.evaluate`` call. ``stats`` is compiled on the
+    fitness vector. The final genomes and fitnesses end up in
+    ``population``.
+    """
+    logbook = tools.Logbook()
+    logbook.header = ["gen", "nevals"] + (stats.fields if stats else [])
+
+    if isinstance(population, Population):
+        genomes = population.genomes
+    else:
+        genomes = np.asarray(population, dtype=np.uint8)
+    spare = np.empty_like(genomes)
+    fitnesses = toolbox.evaluate(genomes)
+    nevals = len(genomes)
+
+    for gen in range(ngen + 1):
+        if gen > 0:
+            winners = toolbox.select_indices(fitnesses, len(genomes))
+            np.take(genomes, winners, axis=0, out=spare)
+            genomes, spare = spare, genomes
+            changed = var_and(genomes, toolbox, cxpb, mutpb)
+            fitnesses = toolbox.evaluate(genomes)
+            nevals = int(changed.sum())
+
+        record = stats.compile(fitnesses) if stats else {}
+        logbook.record(gen=gen, nevals=nevals, **record)
+        if verbose:
+            print(logbook.stream)
+
+    if isinstance(population, Population):
+        if genomes is not population.genomes:
+            population.genomes[:] = genomes
+        population.fitnesses[:] = fitnesses
+        population.sync_fitness()
+    else:
+        for ind, genome, fitness in zip(population, genomes, fitnesses):
+            ind[:] = genome
+            ind.fitness.values = (fitness,)
+
+    return population, logbook
+
+
+def evolve_device(
+    population_size,
+    genome_length,
+    generations,
+    mutation_rate,
+    cxpb,
+    mutpb,
+    tournsize=3,
+    xp=None,
+    seed=None,
+):
+    """
+    Device-resident version of evolve() for very large populations.
+
+    The (pop_size, L) genome matrix is created on the GPU with CuPy and
+    selection, crossover, mutation and evaluation all run as array kernels
+    there; only the per-generation statistics and the best genome are
+    copied back. ``xp`` defaults to CuPy but any module with the NumPy
+    array API (e.g. numpy itself) can be passed; ``seed`` seeds its
+    Generator. Selection and crossover reuse tournament_indices and
+    crossover_batch on the device arrays.
+
+    Returns the logbook, the best genome as a host array and its fitness.
+    """
+    xp = xp or cupy
+    if xp is None:
+        raise ImportError("evolve_device requires CuPy (pip install cupy)")
+
+    n, length = population_size, genome_length
+    rng = xp.random.default_rng(seed)
+
+    logbook = tools.Logbook()
+    logbook.header = ["gen", "nevals", "avg", "std", "min", "max"]
+
+    genomes = rng.integers(0, 256, (n, length)).astype(xp.uint8)
+    fitnesses = genomes.sum(axis=1, dtype=xp.int32)
+    nevals = n
+
+    for gen in range(generations + 1):
+        if gen > 0:
+            winners = tournament_indices(fitnesses, n, tournsize, rng, xp=xp)
+            genomes = genomes[winners]
+
+            # Single-point crossover of pairs (0, 1), (2, 3), ...
+            pairs = xp.flatnonzero(rng.random(n // 2) < cxpb)
+            first, second = 2 * pairs, 2 * pairs + 1
+            genomes[first], genomes[second] = crossover_batch(
+                genomes[first], genomes[second], rng, xp=xp
+            )
+
+            # Byte-flip mutation of the rows picked with probability mutpb
+            mutate = rng.random(n) < mutpb
+            hits = (rng.random((n, length)) < mutation_rate) & mutate[:, None]
+            bits = rng.integers(0, 8, int(hits.sum())).astype(xp.uint8)
+            genomes[hits] ^= xp.left_shift(xp.uint8(1), bits)
+
+            fitnesses = genomes.sum(axis=1, dtype=xp.int32)
+            changed = mutate
+            changed[first] = changed[second] = True
+            nevals = int(changed.sum())
+
+        logbook.record(
+            gen=gen,
+            nevals=nevals,
+            avg=float(fitnesses.mean()),
+            std=float(fitnesses.std()),
+            min=int(fitnesses.min()),
+            max=int(fitnesses.max()),
+        )
+
+    best = int(fitnesses.argmax())
+    best_genome = genomes[best]
+    if hasattr(best_genome, "get"):
+        best_genome = best_genome.get()
+    return logbook, best_genome, int(fitnesses[best])
+
+
 def run_evolution(
     population_size=50,
     genome_length=32,
     generations=20,
     mutation_rate=0.01,
     crossover_rate=0.7,
+    seed=None,
 ):
-    """Run the genetic algorithm and display results."""
+    """Run the genetic algorithm and display results; ``seed`` fixes the run."""
 
     print("=" * 60)
     print("🧬 The Manifold Web - Genetic Algorithm Demo")
@@ -100,13 +464,13 @@ def run_evolution(
     print(f"Crossover rate: {crossover_rate}")
     print("=" * 60 + "\n")
 
-    toolbox = create_toolbox(genome_length, mutation_rate)
+    toolbox = create_toolbox(genome_length, mutation_rate, seed=seed)
 
     # Create initial population
     population = toolbox.population(n=population_size)
 
     # Statistics tracking
-    stats = tools.Statistics(lambda ind: ind.fitness.values)
+    stats = tools.Statistics()
     stats.register("avg", np.mean)
     stats.register("std", np.std)
     stats.register("min", np.min)
@@ -115,7 +479,7 @@ def run_evolution(
     # Run evolution
     print("Starting evolution...\n")
 
-    population, logbook = algorithms.eaSimple(
+    population, logbook = evolve(
         population,
         toolbox,
         cxpb=crossover_rate,
@@ -132,7 +496,7 @@ def run_evolution(
 
     best_individual = tools.selBest(population, k=1)[0]
     print(f"\nBest genome fitness: {best_individual.fitness.values[0]}")
-    print(f"Best genome (first 16 bytes): {best_individual[:16]}")
+    print(f"Best genome (first 16 bytes): {best_individual[:16].tolist()}")
     print(f"Best genome (hex): {' '.join(f'{b:02x}' for b in best_individual[:16])}")
 
     return population, logbook, best_individual
@@ -146,8 +510,8 @@ def demonstrate_crossover_and_mutation():
     print("=" * 60 + "\n")
 
     # Create two parent genomes
-    parent1 = [0xFF] * 10
-    parent2 = [0x00] * 10
+    parent1 = np.full(10, 0xFF, dtype=np.uint8)
+    parent2 = np.zeros(10, dtype=np.uint8)
 
     print("Parent 1:", " ".join(f"{b:02x}" for b in parent1))
     print("Parent 2:", " ".join(f"{b:02x}" for b in parent2))
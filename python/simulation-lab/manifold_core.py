@@ -0,0 +1,145 @@
+"""
+Pure-Python implementation of the Manifold agent simulation.
+
+Plain Mesa agents with attribute state and a dict of resource cells, with
+no NumPy in the step path, so PyPy's tracing JIT can speed up the hot
+loop. Mirrors the API of manifold_fast.py, which demo.py uses on CPython.
+"""
+
+import random
+from collections import defaultdict
+
+from mesa import Agent, Model
+from mesa.time import RandomActivation
+
+
+class ManifoldAgent(Agent):
+    """An autonomous agent in the Manifold simulation."""
+
+    def __init__(self, unique_id, model, initial_energy=100):
+        super().__init__(unique_id, model)
+        self.energy = initial_energy
+        self.alive = True
+        self.resources_collected = 0
+
+    def move(self):
+        """Move to a random neighboring cell."""
+        model = self.model
+        dx, dy = model._nbr_offsets[self.random.getrandbits(3)]
+        x, y = self.pos
+        self.pos = ((x + dx) % model.width, (y + dy) % model.height)
+
+    def consume_resource(self):
+        """Check for and consume resources at current position."""
+        value = self.model.resource_grid.pop(self.pos, 0)
+        if value > 0:
+            self.energy += value
+            self.resources_collected += 1
+            if self.model.verbose:
+                print(
+                    f"Agent {self.unique_id} consumed resource worth "
+                    f"{value} energy (total: {self.energy})"
+                )
+
+    def step(self):
+        """Execute one time step of agent behavior."""
+        if not self.alive:
+            return
+
+        # Move to new position
+        self.move()
+
+        # Lose energy from movement
+        self.energy -= 1
+
+        # Try to consume resource at new position
+        self.consume_resource()
+
+        # Check if agent dies from lack of energy
+        if self.energy <= 0:
+            self.alive = False
+            if self.model.verbose:
+                print(f"Agent {self.unique_id} died from lack of energy")
+
+
+class ManifoldModel(Model):
+    """The main simulation model."""
+
+    def __init__(
+        self,
+        n_agents=10,
+        width=20,
+        height=20,
+        n_resources=15,
+        seed=None,
+        verbose=False,
+        collect_per_agent=False,
+    ):
+        super().__init__()
+        self.num_agents = n_agents
+        self.verbose = verbose
+        self.collect_per_agent = collect_per_agent
+
+        # Moore neighbourhood as (dx, dy) pairs, indexed by a 3-bit draw;
+        # built once so moves never reconstruct the neighbour list
+        self._nbr_offsets = (
+            (-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)
+        )
+        self.width = width
+        self.height = height
+        self.schedule = RandomActivation(self)
+
+        if seed is not None:
+            random.seed(seed)
+
+        # Create agents
+        for i in range(self.num_agents):
+            agent = ManifoldAgent(i, self, initial_energy=100)
+            self.schedule.add(agent)
+
+            # Place agent at random position
+            x = self.random.randrange(self.width)
+            y = self.random.randrange(self.height)
+            agent.pos = (x, y)
+
+        # Energy value of the resource in each occupied cell; cells sharing
+        # a draw pool their energy
+        self.resource_grid = defaultdict(int)
+        for _ in range(n_resources):
+            x = self.random.randrange(self.width)
+            y = self.random.randrange(self.height)
+            self.resource_grid[x, y] += 10
+
+        # Data collection
+        self.alive_count_history = []
+        self.energy_history = [] if collect_per_agent else None
+        self.alive_history = [] if collect_per_agent else None
+
+    @property
+    def n_alive(self):
+        """Number of agents currently alive."""
+        return sum(1 for a in self.schedule.agents if a.alive)
+
+    def summary(self):
+        """Current alive count, mean energy of the living and per-agent state."""
+        agents = self.schedule.agents
+        living = [a.energy for a in agents if a.alive]
+        return {
+            "alive": len(living),
+            "mean_energy": sum(living) / len(living) if living else None,
+            "energy": [a.energy for a in agents],
+            "resources_collected": [a.resources_collected for a in agents],
+        }
+
+    def _collect(self):
+        """Record model and, if enabled, per-agent state."""
+        self.alive_count_history.append(self.n_alive)
+        if self.collect_per_agent:
+            agents = self.schedule.agents
+            self.energy_history.append([a.energy for a in agents])
+            self.alive_history.append([a.alive for a in agents])
+
+    def step(self):
+        """Advance the model by one step."""
+        self._collect()
+        self.schedule.step()
@@ -0,0 +1,395 @@
+"""
+NumPy/Numba implementation of the Manifold agent simulation.
+
+Agent state is kept in structure-of-arrays form on the model and each step
+runs as a handful of array operations plus a small Numba kernel. Mesa agents
+are thin views onto their row of those arrays. See manifold_core.py for the
+pure-Python equivalent used under PyPy.
+"""
+
+import random
+
+import numpy as np
+from mesa import Agent, Model
+from mesa.time import RandomActivation
+
+try:
+    from numba import njit
+
+    HAVE_NUMBA = True
+except ImportError:  # Numba is optional; the kernels also run as plain Python
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+# Integer-only kernels: fastmath is harmless and bounds are guaranteed by
+# the torus wrap, so let Numba drop both checks. cache=True keeps compiled
+# artifacts in __pycache__ so repeat runs skip the JIT.
+JIT_OPTIONS = dict(cache=True, fastmath=True, boundscheck=False)
+
+
+# Moore neighbourhood (excluding the centre cell), indexed by direction 0-7
+DX = np.array([-1, -1, -1, 0, 0, 1, 1, 1], dtype=np.int8)
+DY = np.array([-1, 0, 1, -1, 1, -1, 0, 1], dtype=np.int8)
+
+# Ceiling of the int16 energy and resource arrays
+INT16_MAX = int(np.iinfo(np.int16).max)
+
+
+@njit(**JIT_OPTIONS)
+def _move(i, pos, width, height, rng):
+    """Move agent ``i`` to a random Moore neighbour on the torus."""
+    d = rng.integers(0, 8)
+    pos[i, 0] = (pos[i, 0] + DX[d]) % width
+    pos[i, 1] = (pos[i, 1] + DY[d]) % height
+
+
+@njit(**JIT_OPTIONS)
+def _consume(i, energy, collected, pos, resource_grid):
+    """
+    Consume the resource under agent ``i``; return the resource's energy.
+
+    The agent's energy saturates at INT16_MAX instead of wrapping.
+    """
+    x = pos[i, 0]
+    y = pos[i, 1]
+    value = resource_grid[x, y]
+    if value > 0:
+        energy[i] = min(int(energy[i]) + int(value), INT16_MAX)
+        resource_grid[x, y] = 0
+        collected[i] += 1
+    return value
+
+
+@njit(**JIT_OPTIONS)
+def _update_energy(i, energy, pos, alive, collected, resource_grid):
+    """
+    Charge agent ``i`` for its move, feed it, and retire it if starved.
+
+    Returns the energy of the resource consumed, 0 if there was none.
+    """
+    # Lose energy from movement
+    energy[i] -= 1
+
+    # Try to consume resource at new position
+    value = _consume(i, energy, collected, pos, resource_grid)
+
+    # Check if agent dies from lack of energy
+    if energy[i] <= 0:
+        alive[i] = False
+    return value
+
+
+@njit(**JIT_OPTIONS)
+def _feed_candidates(candidates, energy, collected, pos, resource_grid):
+    """
+    Feed the agents standing on a resource, in the given (random) order.
+
+    Movement, energy decay and death do not depend on other agents and are
+    applied to the whole population as array operations; only agents that
+    landed on a resource cell can contend, so only they are visited here.
+    """
+    for i in candidates:
+        _consume(i, energy, collected, pos, resource_grid)
+
+
+try:
+    # Ahead-of-time build of _feed_candidates produced by build_kernels.py
+    from manifold_kernel import feed_candidates as _feed_kernel
+except ImportError:
+    _feed_kernel = _feed_candidates
+
+
+class ManifoldAgent(Agent):
+    """
+    An autonomous agent in the Manifold simulation.
+
+    The agent's state lives in the model's per-agent arrays; the attributes
+    below read and write this agent's row so the Mesa API keeps working.
+    """
+
+    def __init__(self, unique_id, model, initial_energy=100):
+        super().__init__(unique_id, model)
+        self.energy = initial_energy
+        self.alive = True
+        self.resources_collected = 0
+
+    @property
+    def energy(self):
+        return int(self.model.energy[self.unique_id])
+
+    @energy.setter
+    def energy(self, value):
+        self.model.energy[self.unique_id] = value
+
+    @property
+    def alive(self):
+        return bool(self.model.alive[self.unique_id])
+
+    @alive.setter
+    def alive(self, value):
+        self.model.alive[self.unique_id] = value
+
+    @property
+    def resources_collected(self):
+        return int(self.model.collected[self.unique_id])
+
+    @resources_collected.setter
+    def resources_collected(self, value):
+        self.model.collected[self.unique_id] = value
+
+    @property
+    def pos(self):
+        x, y = self.model.pos[self.unique_id]
+        return (int(x), int(y))
+
+    @pos.setter
+    def pos(self, value):
+        # Agent.__init__ resets pos to None before the model places us
+        if value is not None:
+            self.model.pos[self.unique_id] = value
+
+    def move(self):
+        """Move to a random neighboring cell."""
+        model = self.model
+        if HAVE_NUMBA:
+            _move(self.unique_id, model.pos, model.width, model.height, model.rng)
+            return
+
+        # Interpreted fallback: one getrandbits call picks the direction
+        dx, dy = model._nbr_offsets[self.random.getrandbits(3)]
+        x, y = self.pos
+        self.pos = ((x + dx) % model.width, (y + dy) % model.height)
+
+    def consume_resource(self):
+        """Check for and consume resources at current position."""
+        model = self.model
+        value = _consume(
+            self.unique_id,
+            model.energy,
+            model.collected,
+            model.pos,
+            model.resource_grid,
+        )
+        self._report_consumed(value)
+
+    def _report_consumed(self, value):
+        """Print the consumption line in verbose mode if anything was eaten."""
+        if value > 0 and self.model.verbose:
+            print(
+                f"Agent {self.unique_id} consumed resource worth "
+                f"{value} energy (total: {self.energy})"
+            )
+
+    def step(self):
+        """Execute one time step of agent behavior."""
+        if not self.alive:
+            return
+
+        # Move to new position
+        self.move()
+
+        model = self.model
+        value = _update_energy(
+            self.unique_id,
+            model.energy,
+            model.pos,
+            model.alive,
+            model.collected,
+            model.resource_grid,
+        )
+        self._report_consumed(value)
+        if not self.alive and model.verbose:
+            print(f"Agent {self.unique_id} died from lack of energy")
+
+
+class ManifoldModel(Model):
+    """The main simulation model."""
+
+    def __init__(
+        self,
+        n_agents=10,
+        width=20,
+        height=20,
+        n_resources=15,
+        seed=None,
+        verbose=False,
+        collect_per_agent=False,
+    ):
+        super().__init__()
+        self.num_agents = n_agents
+        self.verbose = verbose
+        self.collect_per_agent = collect_per_agent
+
+        # Moore neighbourhood as (dx, dy) pairs, indexed by a 3-bit draw;
+        # built once so moves never reconstruct the neighbour list
+        self._nbr_offsets = tuple(zip(DX.tolist(), DY.tolist()))
+        self.width = width
+        self.height = height
+        self.schedule = RandomActivation(self)
+
+        if seed is not None:
+            random.seed(seed)
+        self.rng = np.random.default_rng(seed)
+        self._init_arrays()
+
+        # Create agents
+        for i in range(self.num_agents):
+            agent = ManifoldAgent(i, self, initial_energy=100)
+            self.schedule.add(agent)
+
+            # Place agent at random position
+            x = self.random.randrange(self.width)
+            y = self.random.randrange(self.height)
+            agent.pos = (x, y)
+
+        # Create resources; cells sharing a draw pool their energy, summed
+        # wide so a crowded cell is caught instead of wrapping in int16
+        pooled = np.zeros(self.resource_grid.shape, dtype=np.int64)
+        for _ in range(n_resources):
+            x = self.random.randrange(self.width)
+            y = self.random.randrange(self.height)
+            pooled[x, y] += 10
+        if pooled.max(initial=0) > INT16_MAX:
+            raise ValueError(
+                f"a cell pools {pooled.max()} resource energy, over {INT16_MAX}"
+            )
+        self.resource_grid[:] = pooled
+
+        # Data collection: preallocated history buffers, grown on demand.
+        # Per-agent histories grow with steps * n_agents, so they are opt-in.
+        self._n_records = 0
+        self._alive_count_history = np.empty(64, dtype=np.int32)
+        if collect_per_agent:
+            self._energy_history = np.empty((64, n_agents), dtype=self.energy.dtype)
+            self._alive_history = np.empty((64, n_agents), dtype=np.bool_)
+
+    def _init_arrays(self):
+        """Allocate structure-of-arrays storage for agent and resource state."""
+        n = self.num_agents
+        # Energy stays within a few hundred (100 start, -1 per step, +10 per
+        # resource), so int16 halves the bytes the step streams through;
+        # _consume saturates it at INT16_MAX on the rare large haul
+        self.energy = np.empty(n, dtype=np.int16)
+        self.pos = np.empty((n, 2), dtype=np.int32)
+        self.alive = np.ones(n, dtype=np.bool_)
+        self.collected = np.zeros(n, dtype=np.int32)
+        # Energy value of the resource in each cell, 0 if empty; int16 rather
+        # than int8 because resources landing on the same cell pool energy
+        self.resource_grid = np.zeros((self.width, self.height), dtype=np.int16)
+
+    @property
+    def alive_count_history(self):
+        """Number of live agents at the start of each recorded step."""
+        return self._alive_count_history[: self._n_records]
+
+    @property
+    def energy_history(self):
+        """
+        Per-agent energy at each recorded step, shape (steps, n_agents).
+
+        None unless the model was created with collect_per_agent=True.
+        """
+        if not self.collect_per_agent:
+            return None
+        return self._energy_history[: self._n_records]
+
+    @property
+    def alive_history(self):
+        """
+        Per-agent alive flags at each recorded step, shape (steps, n_agents).
+
+        None unless the model was created with collect_per_agent=True.
+        """
+        if not self.collect_per_agent:
+            return None
+        return self._alive_history[: self._n_records]
+
+    def _collect(self):
+        """Record model and agent state by copying whole arrays."""
+        t = self._n_records
+        if t == len(self._alive_count_history):
+            self._alive_count_history = np.resize(self._alive_count_history, 2 * t)
+            if self.collect_per_agent:
+                self._energy_history = np.resize(
+                    self._energy_history, (2 * t, self.num_agents)
+                )
+                self._alive_history = np.resize(
+                    self._alive_history, (2 * t, self.num_agents)
+                )
+
+        self._alive_count_history[t] = self.alive.sum()
+        if self.collect_per_agent:
+            self._energy_history[t] = self.energy
+            self._alive_history[t] = self.alive
+        self._n_records = t + 1
+
+    def step(self):
+        """Advance the model by one step."""
+        self._collect()
+
+        # Move every live agent to a random Moore neighbour in one batch
+        d = self.rng.integers(0, 8, size=self.num_agents)
+        x, y = self.pos[:, 0], self.pos[:, 1]
+        x[:] = np.where(self.alive, (x + DX[d]) % self.width, x)
+        y[:] = np.where(self.alive, (y + DY[d]) % self.height, y)
+
+        # Lose energy from movement
+        np.subtract(self.energy, 1, out=self.energy, where=self.alive)
+
+        # Probe the resource grid at every agent's cell in one gather and
+        # resolve contention among those that hit, in random order like
+        # RandomActivation
+        on_resource = self.alive & (self.resource_grid[x, y] > 0)
+        candidates = self.rng.permutation(np.flatnonzero(on_resource))
+        if self.verbose:
+            collected_before = self.collected[candidates]
+        _feed_kernel(
+            candidates,
+            self.energy,
+            self.collected,
+            self.pos,
+            self.resource_grid,
+        )
+
+        # Check if agents die from lack of energy
+        starved = self.alive & (self.energy <= 0)
+        self.alive &= ~starved
+
+        if self.verbose:
+            self._log_events(
+                candidates[self.collected[candidates] != collected_before],
+                np.flatnonzero(starved),
+            )
+
+        # The agents were stepped above, so advance the schedule's clock the
+        # way RandomActivation.step() would
+        self.schedule.steps += 1
+        self.schedule.time += 1
+
+    @property
+    def n_alive(self):
+        """Number of agents currently alive."""
+        return int(self.alive.sum())
+
+    def summary(self):
+        """Current alive count, mean energy of the living and per-agent state."""
+        n_alive = self.n_alive
+        return {
+            "alive": n_alive,
+            "mean_energy": float(self.energy[self.alive].mean()) if n_alive else None,
+            "energy": self.energy.tolist(),
+            "resources_collected": self.collected.tolist(),
+        }
+
+    def _log_events(self, consumed, died):
+        """Print one summary line per event type for the step just taken."""
+        step = self._n_records
+        if consumed.size:
+            print(f"Step {step}: agents {consumed.tolist()} consumed resources")
+        if died.size:
+            print(f"Step {step}: agents {died.tolist()} died from lack of energy")
@@ -0,0 +1,14 @@
+"""
+Build the optional Cython GA operators used by ga_demo.py.
+
+Usage: python setup.py build_ext --inplace
+"""
+
+from Cython.Build import cythonize
+from setuptools import setup
+
+setup(
+    name="manifold-simulation-lab-ga-ops",
+    ext_modules=cythonize("ga_ops.pyx"),
+    zip_safe=False,
+)
@@ -1,12 +1,33 @@
 """Unit tests for the simulation lab."""
 
+import numpy as np
 import pytest
-from demo import ManifoldAgent, ManifoldModel, Resource
+import manifold_core
+import manifold_fast
+import ga_demo
+from demo import ManifoldAgent, ManifoldModel, run_batch
+from ga_demo import (
+    batch_map,
+    create_toolbox,
+    crossover_batch,
+    evaluate_genome,
+    evolve,
+    evolve_device,
+    mutate_byte_flip,
+    select_tournament,
+    tournament_indices,
+)
 
 
-def test_agent_creation():
+@pytest.fixture(params=[manifold_core, manifold_fast], ids=["core", "fast"])
+def model_cls(request):
+    """ManifoldModel of each backend, so agent tests cover both."""
+    return request.param.ManifoldModel
+
+
+def test_agent_creation(model_cls):
     """Test that agents are created with correct initial state."""
-    model = ManifoldModel(n_agents=1, width=10, height=10, n_resources=0, seed=42)
+    model = model_cls(n_agents=1, width=10, height=10, n_resources=0, seed=42)
     agent = model.schedule.agents[0]
 
     assert agent.energy == 100
@@ -14,9 +35,9 @@ def test_agent_creation():
     assert agent.resources_collected == 0
 
 
-def test_agent_movement():
+def test_agent_movement(model_cls):
     """Test that agents can move to neighboring cells."""
-    model = ManifoldModel(n_agents=1, width=10, height=10, n_resources=0, seed=42)
+    model = model_cls(n_agents=1, width=10, height=10, n_resources=0, seed=42)
     agent = model.schedule.agents[0]
 
     initial_pos = agent.pos
@@ -24,12 +45,12 @@ def test_agent_movement():
     new_pos = agent.pos
 
     # Position should change (unless grid is size 1x1)
-    assert initial_pos != new_pos or (model.grid.width == 1 and model.grid.height == 1)
+    assert initial_pos != new_pos or (model.width == 1 and model.height == 1)
 
 
-def test_energy_decay():
+def test_energy_decay(model_cls):
     """Test that agents lose energy when moving."""
-    model = ManifoldModel(n_agents=1, width=10, height=10, n_resources=0, seed=42)
+    model = model_cls(n_agents=1, width=10, height=10, n_resources=0, seed=42)
     agent = model.schedule.agents[0]
 
     initial_energy = agent.energy
@@ -39,14 +60,13 @@ def test_energy_decay():
     assert agent.energy == initial_energy - 1
 
 
-def test_resource_consumption():
+def test_resource_consumption(model_cls):
     """Test that agents can consume resources."""
-    model = ManifoldModel(n_agents=1, width=10, height=10, n_resources=1, seed=42)
+    model = model_cls(n_agents=1, width=10, height=10, n_resources=1, seed=42)
     agent = model.schedule.agents[0]
 
     # Place resource at agent's position
-    resource = Resource(energy_value=10)
-    model.grid.place_agent(resource, agent.pos)
+    model.resource_grid[agent.pos] = 10
 
     initial_energy = agent.energy
     agent.consume_resource()
@@ -54,12 +74,26 @@ def test_resource_consumption():
     # Energy should increase by resource value
     assert agent.energy == initial_energy + 10
     assert agent.resources_collected == 1
-    assert resource.consumed is True
+    assert model.resource_grid[agent.pos] == 0
+
+
+def test_verbose_agent_step_reports_consumption(model_cls, capsys):
+    """Test that a verbose agent step prints what it consumed."""
+    model = model_cls(
+        n_agents=1, width=1, height=1, n_resources=1, seed=42, verbose=True
+    )
+    agent = model.schedule.agents[0]
+
+    agent.step()
+
+    assert capsys.readouterr().out == (
+        "Agent 0 consumed resource worth 10 energy (total: 109)\n"
+    )
 
 
-def test_agent_death():
+def test_agent_death(model_cls):
     """Test that agents die when energy reaches zero."""
-    model = ManifoldModel(n_agents=1, width=10, height=10, n_resources=0, seed=42)
+    model = model_cls(n_agents=1, width=10, height=10, n_resources=0, seed=42)
     agent = model.schedule.agents[0]
 
     # Drain energy
@@ -71,9 +105,9 @@ def test_agent_death():
     assert agent.energy <= 0
 
 
-def test_simulation_runs():
+def test_simulation_runs(model_cls):
     """Test that the full simulation can run without errors."""
-    model = ManifoldModel(n_agents=5, width=10, height=10, n_resources=10, seed=42)
+    model = model_cls(n_agents=5, width=10, height=10, n_resources=10, seed=42)
 
     # Run for 10 steps
     for _ in range(10):
@@ -83,5 +117,333 @@ def test_simulation_runs():
     assert len(model.schedule.agents) == 5
 
 
+def test_schedule_counts_model_steps(model_cls):
+    """Test that the schedule's step counter and clock follow model steps."""
+    model = model_cls(n_agents=3, width=10, height=10, n_resources=5, seed=42)
+
+    for _ in range(5):
+        model.step()
+
+    assert model.schedule.steps == 5
+    assert model.schedule.time == 5
+
+
+def test_history_recorded_each_step():
+    """Test that the model records alive counts and energy every step."""
+    model = ManifoldModel(
+        n_agents=3,
+        width=10,
+        height=10,
+        n_resources=0,
+        seed=42,
+        collect_per_agent=True,
+    )
+
+    # Run past the initial buffer capacity
+    for _ in range(100):
+        model.step()
+
+    assert model.alive_count_history.shape == (100,)
+    assert model.energy_history.shape == (100, 3)
+    assert list(model.alive_count_history[:2]) == [3, 3]
+    assert list(model.energy_history[:2, 0]) == [100, 99]
+    assert model.energy_history[-1, 0] == 1
+
+
+def test_per_agent_history_is_opt_in():
+    """Test that only aggregate counters are collected by default."""
+    model = ManifoldModel(n_agents=3, width=10, height=10, n_resources=0, seed=42)
+    model.step()
+
+    assert list(model.alive_count_history) == [3]
+    assert model.energy_history is None
+    assert model.alive_history is None
+
+
+@pytest.mark.parametrize("verbose", [True, False])
+def test_verbose_logs_one_line_per_event(capsys, verbose):
+    """Test that a verbose step prints one line per event type, else none."""
+    model = manifold_fast.ManifoldModel(
+        n_agents=3, width=1, height=1, n_resources=1, seed=0, verbose=verbose
+    )
+    model.energy[:] = 1
+
+    model.step()
+
+    lines = capsys.readouterr().out.splitlines()
+    if not verbose:
+        assert lines == []
+        return
+    assert len(lines) == 2
+    assert lines[0].endswith("consumed resources")
+    assert lines[1].endswith("died from lack of energy")
+
+
+def test_fast_model_runs_large_resource_counts():
+    """Test that thousands of resources fit the int16 grid on a large map."""
+    model = manifold_fast.ManifoldModel(
+        n_agents=1000, width=200, height=200, n_resources=5000, seed=0
+    )
+    assert model.resource_grid.sum() == 50_000
+
+    for _ in range(5):
+        model.step()
+
+    assert model.n_alive == 1000
+    assert (model.energy > 0).all()
+
+
+def test_fast_model_energy_saturates_at_int16_max():
+    """Test that a huge haul clamps energy at the int16 ceiling."""
+    model = manifold_fast.ManifoldModel(
+        n_agents=1, width=1, height=1, n_resources=3276, seed=0
+    )
+    assert model.resource_grid[0, 0] == 32760
+
+    model.step()
+
+    assert model.energy[0] == np.iinfo(np.int16).max
+    assert model.collected[0] == 1
+    assert model.resource_grid[0, 0] == 0
+
+
+def test_run_batch_parallel_matches_sequential():
+    """Test that replicas are reproducible per seed across processes."""
+    seeds = [1, 2, 3, 4]
+    parallel = run_batch(len(seeds), steps=10, n_agents=3, seeds=seeds)
+    sequential = run_batch(
+        len(seeds), steps=10, n_agents=3, seeds=seeds, processes=1
+    )
+
+    assert [r["seed"] for r in parallel] == seeds
+    for par, seq in zip(parallel, sequential):
+        assert par["alive"] == seq["alive"]
+        assert list(par["energy"]) == list(seq["energy"])
+
+
+def test_run_batch_rejects_mismatched_seeds():
+    """Test that explicit seeds must match the replica count."""
+    with pytest.raises(ValueError):
+        run_batch(3, steps=1, n_agents=1, seeds=[1, 2])
+
+
+def test_core_model_matches_fast_api():
+    """Test that the pure-Python model reports the same shape of results."""
+    fast = ManifoldModel(n_agents=4, width=10, height=10, n_resources=5, seed=42)
+    core = manifold_core.ManifoldModel(
+        n_agents=4, width=10, height=10, n_resources=5, seed=42
+    )
+
+    for _ in range(5):
+        fast.step()
+        core.step()
+
+    assert core.summary().keys() == fast.summary().keys()
+    assert list(core.alive_count_history) == [4] * 5
+    assert len(core.summary()["energy"]) == 4
+    assert core.energy_history is None
+
+
+def test_evaluate_genome_single_and_batch():
+    """Test that one genome gets a fitness tuple and a batch one per row."""
+    genomes = np.arange(12, dtype=np.uint8).reshape(3, 4)
+
+    assert evaluate_genome(genomes[1]) == (22,)
+    assert evaluate_genome(genomes).tolist() == [6, 22, 38]
+    assert batch_map(evaluate_genome, list(genomes)) == [(6,), (22,), (38,)]
+    assert batch_map(evaluate_genome, []) == []
+
+
+@pytest.mark.parametrize("length", [64, 13])
+def test_mutate_byte_flip_flips_one_bit_per_byte(length):
+    """Test that each mutated byte differs from the original in one bit."""
+    genome = np.arange(length, dtype=np.uint8)
+    original = genome.copy()
+
+    (mutated,) = mutate_byte_flip(genome, 0.5, rng=np.random.default_rng(0))
+
+    flipped = np.unpackbits((mutated ^ original)[:, None], axis=1).sum(axis=1)
+    assert mutated is genome
+    assert flipped.max() == 1
+    assert flipped.sum() > 0
+
+
+def test_mutate_byte_flip_rate():
+    """Test that the fraction of mutated bytes matches the mutation rate."""
+    genome = np.zeros(100_000, dtype=np.uint8)
+
+    mutate_byte_flip(genome, 0.1, rng=np.random.default_rng(0))
+
+    assert np.count_nonzero(genome) / genome.size == pytest.approx(0.1, rel=0.05)
+
+
+@pytest.mark.parametrize("length", [16, 13])
+def test_mutate_byte_flip_matrix_in_place(length):
+    """Test that a whole genome matrix is mutated in place."""
+    matrix = np.zeros((10, length), dtype=np.uint8)
+
+    (mutated,) = mutate_byte_flip(matrix, 0.5, rng=np.random.default_rng(0))
+
+    assert mutated is matrix
+    assert matrix.shape == (10, length)
+    assert np.count_nonzero(matrix) > 0
+    assert np.isin(matrix, [1 << bit for bit in range(8)] + [0]).all()
+
+
+def test_crossover_batch_swaps_tails():
+    """Test that batched crossover swaps each pair's tail at one point."""
+    parents1 = np.full((20, 8), 0xFF, dtype=np.uint8)
+    parents2 = np.zeros((20, 8), dtype=np.uint8)
+
+    child1, child2 = crossover_batch(parents1, parents2)
+
+    # Children are complementary and switch parent exactly once per row
+    assert np.array_equal(child1 ^ child2, parents1)
+    for row in child1:
+        switch = np.flatnonzero(np.diff(row.astype(np.int16)))
+        assert len(switch) == 1
+        assert row[0] == 0xFF and row[-1] == 0x00
+
+
+@pytest.mark.parametrize("k, tournsize", [(30, 3), (5, 7), (1, 1)])
+def test_tournament_winner_is_best_contestant(k, tournsize):
+    """Test that each of the k winners is the fittest of its contestants."""
+    fitnesses = np.random.default_rng(0).permutation(50).astype(np.float64)
+
+    winners = tournament_indices(fitnesses, k, tournsize, np.random.default_rng(1))
+
+    # Replay the same draw to recover each tournament's contestants
+    contestants = np.random.default_rng(1).integers(0, 50, size=(k, tournsize))
+    assert winners.shape == (k,)
+    assert np.array_equal(fitnesses[winners], fitnesses[contestants].max(axis=1))
+
+
+def test_population_sized_tournament_picks_best_contestant():
+    """Test population-sized tournaments on a seeded toolbox's population."""
+    toolbox = create_toolbox(genome_length=8, seed=0)
+    population = toolbox.population(n=12)
+    population.fitnesses[:] = evaluate_genome(population.genomes)
+    population.sync_fitness()
+    n = len(population)
+
+    winners = tournament_indices(population.fitnesses, 20, n, np.random.default_rng(1))
+    selected = select_tournament(population, 4, n, np.random.default_rng(2))
+
+    # Contestants are drawn with replacement, like DEAP's selTournament
+    contestants = np.random.default_rng(1).integers(0, n, size=(20, n))
+    assert np.array_equal(
+        population.fitnesses[winners],
+        population.fitnesses[contestants].max(axis=1),
+    )
+    contestants = np.random.default_rng(2).integers(0, n, size=(4, n))
+    assert [ind.fitness.values[0] for ind in selected] == (
+        population.fitnesses[contestants].max(axis=1).tolist()
+    )
+
+
+def test_native_evaluate_matches_numpy(monkeypatch):
+    """Test the Cython evaluator, including the threaded chunked path."""
+    pytest.importorskip("ga_ops")
+    genomes = np.random.default_rng(0).integers(0, 256, (10, 33), dtype=np.uint8)
+    expected = evaluate_genome(genomes)
+
+    assert np.array_equal(ga_demo.evaluate_genome_native(genomes), expected)
+    monkeypatch.setattr(ga_demo, "EVAL_CHUNK_ROWS", 3)
+    assert np.array_equal(ga_demo.evaluate_genome_native(genomes), expected)
+
+
+@pytest.mark.parametrize("shape", [(40,), (6, 13)])
+def test_native_mutation_flips_one_bit_per_byte(shape):
+    """Test that the Cython mutation flips at most one bit in each byte."""
+    pytest.importorskip("ga_ops")
+    genome = np.zeros(shape, dtype=np.uint8)
+
+    (mutated,) = ga_demo.mutate_byte_flip_native(
+        genome, 0.5, rng=np.random.default_rng(0)
+    )
+
+    assert mutated is genome
+    assert np.count_nonzero(genome) > 0
+    assert np.isin(genome, [1 << bit for bit in range(8)] + [0]).all()
+
+
+def test_native_crossover_swaps_tails_at_points():
+    """Test that the Cython crossover swaps each row's tail at its point."""
+    ga_ops = pytest.importorskip("ga_ops")
+    child1 = np.full((3, 5), 0xFF, dtype=np.uint8)
+    child2 = np.zeros((3, 5), dtype=np.uint8)
+
+    ga_ops.crossover_batch(child1, child2, np.array([1, 3, 5], dtype=np.int64))
+
+    assert child1.tolist() == [
+        [0xFF, 0, 0, 0, 0],
+        [0xFF, 0xFF, 0xFF, 0, 0],
+        [0xFF] * 5,
+    ]
+    assert np.array_equal(child1 ^ child2, np.full((3, 5), 0xFF))
+
+
+def test_evolve_keeps_population_views_in_sync():
+    """Test that evolved individuals are row views matching their fitness."""
+    toolbox = create_toolbox(genome_length=16, mutation_rate=0.1)
+    population = toolbox.population(n=10)
+
+    population, logbook = evolve(population, toolbox, cxpb=0.7, mutpb=0.5, ngen=3)
+
+    assert len(logbook) == 4
+    assert np.array_equal(np.asarray(population), population.genomes)
+    for individual in population:
+        assert individual.fitness.values[0] == individual.sum()
+
+
+def test_seeded_toolbox_is_reproducible():
+    """Test that two toolboxes with the same seed evolve identical runs."""
+    runs = []
+    for _ in range(2):
+        toolbox = create_toolbox(genome_length=16, mutation_rate=0.1, seed=7)
+        population = toolbox.population(n=10)
+        evolve(population, toolbox, cxpb=0.7, mutpb=0.5, ngen=3)
+        runs.append(population.genomes.copy())
+
+    assert np.array_equal(runs[0], runs[1])
+
+
+def test_evolve_device_with_numpy_backend():
+    """Test the device GA loop using NumPy in place of CuPy."""
+    logbook, best_genome, best_fitness = evolve_device(
+        population_size=20,
+        genome_length=16,
+        generations=5,
+        mutation_rate=0.05,
+        cxpb=0.7,
+        mutpb=0.5,
+        xp=np,
+    )
+
+    assert len(logbook) == 6
+    assert best_genome.shape == (16,)
+    assert best_fitness == int(best_genome.sum())
+    assert best_fitness == logbook[-1]["max"]
+
+
+@pytest.mark.parametrize("genome_length", [1, 2])
+def test_evolve_device_short_genomes(genome_length):
+    """Test that genomes too short to cross over still evolve."""
+    logbook, best_genome, best_fitness = evolve_device(
+        population_size=10,
+        genome_length=genome_length,
+        generations=3,
+        mutation_rate=0.5,
+        cxpb=1.0,
+        mutpb=0.5,
+        xp=np,
+        seed=0,
+    )
+
+    assert len(logbook) == 4
+    assert best_genome.shape == (genome_length,)
+    assert best_fitness == int(best_genome.sum())
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])